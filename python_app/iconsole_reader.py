@@ -5,14 +5,20 @@ Connects to iConsole exercise bike and updates menu bar
 """
 
 import asyncio
+import atexit
 import logging
+import re
 import struct
 import time
 import json
+import os
 import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
+from math import fsum
 from bleak import BleakClient, BleakScanner
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Deque, Callable, Tuple
 from pathlib import Path
 from menubar_app import main as menubar_main
 
@@ -30,7 +36,63 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Max speed samples held in the averaging window (fixed-size ring buffer)
+SPEED_BUFFER_SIZE = 256
+
+# Seconds of speed readings averaged into the displayed speed
+SPEED_WINDOW = 3.0
+
+# Advertised device names that identify an iConsole bike
+ICONSOLE_NAME_RE = re.compile(r"iconsole", re.IGNORECASE)
+
+# Ignore advertisers weaker than this (dBm); too far away to hold a connection
+MIN_RSSI = -90
+
+# Minimum seconds between total distance writes while riding
+DISTANCE_SAVE_INTERVAL = 30.0
+
+# Wheel circumference in meters
+WHEEL_CIRCUMFERENCE_M = 1.0525
+# Revolutions per 1/1024 s wheel-event tick -> km/h, folded into one multiplier
+WHEEL_KMH_FACTOR = WHEEL_CIRCUMFERENCE_M * 3.6 * 1024.0
+
+# Characteristics with a dedicated speed parser
+INDOOR_BIKE_DATA_UUID = "00002ad2-0000-1000-8000-00805f9b34fb"
+CSC_MEASUREMENT_UUID = "00002a5b-0000-1000-8000-00805f9b34fb"
+# Reader method that extracts speed from each of them
+SPEED_PARSERS = {
+    INDOOR_BIKE_DATA_UUID: '_parse_indoor_bike_data',
+    CSC_MEASUREMENT_UUID: '_parse_csc_measurement',
+}
+
+# Standard speed characteristics, in order of preference. Only one is kept
+# subscribed when it delivers data; extra subscriptions share link bandwidth.
+PREFERRED_CHARACTERISTICS = (INDOOR_BIKE_DATA_UUID, CSC_MEASUREMENT_UUID)
+# Characteristic properties that deliver values without polling
+NOTIFY_PROPERTIES = frozenset(("notify", "indicate"))
+# Seconds to wait for the first notification from a preferred characteristic
+FIRST_DATA_TIMEOUT = 2.0
+
+# Raw notifications buffered between the BLE callback and the parser task
+NOTIFY_QUEUE_SIZE = 64
+
+# Precompiled decoders for the notification payloads (bound unpack_from methods)
+_unpack_u16 = struct.Struct('<H').unpack_from
+_unpack_indoor_bike_speed = struct.Struct('<HH').unpack_from  # flags, instantaneous speed (0.01 km/h)
+_unpack_csc_wheel = struct.Struct('<BLH').unpack_from  # flags, cumulative wheel revs, last wheel event time
+
 class iConsoleDataReader:
+    # Fixed attribute layout: no per-instance __dict__, faster attribute access on the hot path
+    __slots__ = (
+        'device_address', 'client', 'is_connected', 'menubar_app',
+        'data_dir', 'distance_file', 'total_distance_km', '_distance_dirty', '_last_distance_save',
+        '_save_pool', '_save_future', '_flush_lock',
+        'speed_datapoints', 'current_speed', 'last_data_time',
+        'last_wheel_revs', 'last_wheel_time',
+        '_notify_queue', '_consumer_task', '_dropped_notifications', '_data_received', '_stop_event',
+        'update_thread', '_stop_updates',
+    )
+    
     def __init__(self):
         self.device_address = None
         self.client: Optional[BleakClient] = None
@@ -42,20 +104,39 @@ class iConsoleDataReader:
         self.data_dir.mkdir(parents=True, exist_ok=True)
         self.distance_file = self.data_dir / "total_distance.json"
         self.total_distance_km = self._load_total_distance()
+        self._distance_dirty = False
+        self._last_distance_save = 0.0
+        # Single writer thread so a slow disk never stalls the 1 Hz update tick
+        self._save_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="distance-save")
+        self._save_future: Optional[Future] = None
+        # Quit (main thread) and disconnect() (BLE thread) can both flush; only one may write at a time
+        self._flush_lock = threading.Lock()
+        # Last resort for exits that skip both disconnect() and the menu bar Quit hook
+        atexit.register(self._flush_total_distance)
         
         # Speed tracking
-        self.speed_datapoints: List[float] = []  # Speed readings from last 3 seconds
-        self.datapoints_lock = threading.Lock()
+        # (monotonic time, speed) readings within the averaging window. Written by the BLE
+        # loop, trimmed by the update thread; deque append/popleft are atomic, so no lock.
+        self.speed_datapoints: Deque[Tuple[float, float]] = deque(maxlen=SPEED_BUFFER_SIZE)
         self.current_speed = 0.0
-        self.last_data_time = time.time()
+        self.last_data_time = time.monotonic()
         
         # Wheel tracking for speed calculation
         self.last_wheel_revs = None
         self.last_wheel_time = None
         
+        # Raw notifications waiting to be parsed
+        self._notify_queue: asyncio.Queue = asyncio.Queue(maxsize=NOTIFY_QUEUE_SIZE)
+        self._consumer_task: Optional[asyncio.Task] = None
+        self._dropped_notifications = 0
+        self._data_received = asyncio.Event()  # Set by the first parsed speed after subscribing
+        
+        # Set when the stream should end (disconnect requested or link dropped)
+        self._stop_event = asyncio.Event()
+        
         # Update thread
         self.update_thread = None
-        self.stop_updates = False
+        self._stop_updates = threading.Event()  # Wakes the worker out of its tick sleep
         
 
     
@@ -73,96 +154,164 @@ class iConsoleDataReader:
     def _save_total_distance(self):
         """Save total distance to file"""
         try:
-            with open(self.distance_file, 'w') as f:
-                json.dump({'total_km': self.total_distance_km, 'last_updated': datetime.now().isoformat()}, f)
+            # Write to a temp file and swap it in so a crash never leaves a partial file
+            tmp_file = self.distance_file.with_suffix('.tmp')
+            with open(tmp_file, 'w') as f:
+                # Fixed two-field record; formatted directly rather than through the JSON encoder
+                f.write(f'{{"total_km":{self.total_distance_km!r},"last_updated":"{datetime.now().isoformat()}"}}')
+            os.replace(tmp_file, self.distance_file)
         except Exception as e:
             logger.error(f"Could not save distance: {e}")
     
+    def _schedule_distance_save(self):
+        """Save total distance on the writer thread, unless a save is still in flight"""
+        if self._save_future and not self._save_future.done():
+            return
+        try:
+            self._save_future = self._save_pool.submit(self._save_total_distance)
+        except RuntimeError as e:
+            # Pool already shut down (disconnect or interpreter exit); the final flush saves it
+            logger.debug(f"Could not schedule distance save: {e}")
+            return
+        self._distance_dirty = False
+        self._last_distance_save = time.monotonic()
+    
+    def _flush_total_distance(self):
+        """Save total distance now if it changed since the last save"""
+        with self._flush_lock:
+            # Let an in-flight background save finish first; both write the same temp file
+            if self._save_future:
+                self._save_future.result()
+            if self._distance_dirty:
+                self._distance_dirty = False
+                self._save_total_distance()
+    
     def _add_speed_datapoint(self, speed: float):
         """Add a speed datapoint"""
         # Discard unrealistic speed readings over 50 km/h
         if speed > 50.0:
-            logger.warning(f"Discarding unrealistic speed reading: {speed:.1f} km/h (over 50 km/h limit)")
+            logger.warning("Discarding unrealistic speed reading: %.1f km/h (over 50 km/h limit)", speed)
             return
         
-        current_time = time.time()
-        with self.datapoints_lock:
-            self.speed_datapoints.append(speed)
-            self.last_data_time = current_time
-            logger.info(f"Speed: {speed:.1f} km/h")
+        now = time.monotonic()
+        self.speed_datapoints.append((now, speed))
+        self.last_data_time = now
+        logger.debug("Speed: %.1f km/h", speed)
     
     def _update_worker(self):
         """Background thread that updates menu bar every second"""
         logger.info("Update worker started")
+        last_posted = None
+        monotonic = time.monotonic  # Bound once; called several times per tick
+        # Absolute deadlines keep a steady 1 Hz cadence regardless of how long each pass takes
+        next_tick = monotonic()
+        # Speed and time at the previous tick, for integrating distance
+        prev_speed = self.current_speed
+        prev_time = next_tick
         
-        while not self.stop_updates:
-            current_time = time.time()
+        while not self._stop_updates.is_set():
+            current_time = monotonic()
             
-            with self.datapoints_lock:
-                # Remove datapoints older than 3 seconds
-                cutoff_time = current_time - 3.0
-                recent_datapoints = [dp for dp in self.speed_datapoints if True]  # Keep all for now, filter by time
-                
-                if recent_datapoints:
-                    # Average speed from recent datapoints
-                    old_speed = self.current_speed
-                    self.current_speed = sum(recent_datapoints) / len(recent_datapoints)
-                    self.speed_datapoints.clear()  # Clear after averaging
-                    logger.info(f"Speed updated: {old_speed:.1f} -> {self.current_speed:.1f} km/h from {len(recent_datapoints)} datapoints")
-                else:
-                    # No recent data - decay speed by 33% per second
-                    time_since_data = current_time - self.last_data_time
-                    if time_since_data > 1.0:
-                        old_speed = self.current_speed
-                        decay_factor = 0.67 ** int(time_since_data)
-                        self.current_speed *= decay_factor
-                        if self.current_speed < 0.1:
-                            self.current_speed = 0.0
-                        if old_speed != self.current_speed:
-                            pass
+            # Expire readings that have slid out of the averaging window. Once readings have
+            # stopped for over a second the whole window is stale, so decay takes over.
+            datapoints = self.speed_datapoints
+            if current_time - self.last_data_time > 1.0:
+                cutoff = current_time - 1.0
+            else:
+                cutoff = current_time - SPEED_WINDOW
+            while datapoints and datapoints[0][0] < cutoff:
+                datapoints.popleft()
             
-            # Add distance based on current speed (distance = speed * time)
-            if self.current_speed > 0:
-                distance_increment = (self.current_speed / 3600.0)  # km per second
-                self.total_distance_km += distance_increment
-                self._save_total_distance()
+            window = list(datapoints)
+            if window:
+                # Average speed over the window
+                old_speed = self.current_speed
+                count = len(window)
+                self.current_speed = fsum([speed for _, speed in window]) / count
+                logger.debug("Speed updated: %.1f -> %.1f km/h from %d datapoints", old_speed, self.current_speed, count)
+            else:
+                # No recent data - decay speed by 33% per second, one step per tick
+                if self.current_speed and current_time - self.last_data_time > 1.0:
+                    speed = self.current_speed * 0.67
+                    self.current_speed = speed if speed >= 0.1 else 0.0
+            
+            # Add distance covered since the last tick (trapezoid over the measured interval)
+            if self.current_speed > 0 or prev_speed > 0:
+                hours = (current_time - prev_time) / 3600.0
+                self.total_distance_km += (prev_speed + self.current_speed) * 0.5 * hours
+                self._distance_dirty = True
+            prev_speed = self.current_speed
+            prev_time = current_time
+            
+            # Coalesce distance writes instead of hitting the disk every tick
+            if self._distance_dirty and current_time - self._last_distance_save >= DISTANCE_SAVE_INTERVAL:
+                self._schedule_distance_save()
             
-            # Update menu bar
+            # Hand the latest values to the menu bar; it redraws on its own run loop.
+            # When idle nothing changes, so skip the post entirely.
             if self.menubar_app:
-                self.menubar_app.update_display(self.current_speed, self.total_distance_km)
+                values = (self.current_speed, self.total_distance_km)
+                if values != last_posted:
+                    self.menubar_app.post_update(*values)
+                    last_posted = values
             else:
                 logger.warning("Menu bar app not available")
             
-            time.sleep(1.0)  # Update every second
+            # Update every second
+            next_tick += 1.0
+            sleep_for = next_tick - monotonic()
+            if sleep_for > 0:
+                self._stop_updates.wait(sleep_for)
+            else:
+                next_tick = monotonic()  # Overran; restart the schedule from now
         
         logger.info("Update worker stopped")
     
     def start_update_thread(self):
         """Start the update thread"""
-        self.stop_updates = False
+        self._stop_updates.clear()
         self.update_thread = threading.Thread(target=self._update_worker, daemon=True)
         self.update_thread.start()
     
     def stop_update_thread(self):
         """Stop the update thread"""
-        self.stop_updates = True
+        self._stop_updates.set()
         if self.update_thread:
             self.update_thread.join()
+        
+        # Flush any distance accumulated since the last periodic save
+        self._flush_total_distance()
+        
+        # The worker no longer decays the display, so clear the speed from the menu bar
+        self.current_speed = 0.0
+        if self.menubar_app:
+            self.menubar_app.post_update(0.0, self.total_distance_km)
     
-    async def find_iconsole_device(self) -> bool:
+    async def find_iconsole_device(self, min_rssi: int = MIN_RSSI) -> bool:
         """Find and set iConsole device"""
         logger.info("Scanning for iConsole devices...")
         
         while True:
+            rejected = set()  # Named non-iConsole addresses, skipped on repeat adverts
+            
+            def is_iconsole(device, adv) -> bool:
+                if device.address in rejected or adv.rssi < min_rssi:
+                    return False
+                name = adv.local_name or device.name
+                if not name:
+                    return False
+                if ICONSOLE_NAME_RE.search(name):
+                    logger.info(f"Found iConsole device: {name} ({device.address}, RSSI {adv.rssi})")
+                    return True
+                rejected.add(device.address)
+                return False
+            
             try:
-                scanner = BleakScanner()
-                devices = await scanner.discover(timeout=10.0)
-                
-                for device in devices:
-                    if device.name and "iconsole" in device.name.lower():
-                        self.device_address = device.address
-                        logger.info(f"Found iConsole device: {device.name} ({device.address})")
-                        return True
+                # Stops scanning as soon as a bike shows up instead of waiting out the timeout
+                device = await BleakScanner.find_device_by_filter(is_iconsole, timeout=10.0)
+                if device:
+                    self.device_address = device.address
+                    return True
                 
                 logger.warning("No iConsole devices found, retrying in 5 seconds...")
                 await asyncio.sleep(5.0)
@@ -179,7 +328,7 @@ class iConsoleDataReader:
         
         try:
             logger.info(f"Connecting to {self.device_address}...")
-            self.client = BleakClient(self.device_address)
+            self.client = BleakClient(self.device_address, disconnected_callback=self._on_disconnected)
             await self.client.connect()
             
             if self.client.is_connected:
@@ -188,14 +337,34 @@ class iConsoleDataReader:
                 return True
             else:
                 logger.error("Failed to connect")
-                return False
         except Exception as e:
             logger.error(f"Connection error: {e}")
-            return False
+        
+        # Release the half-open client so a failed attempt doesn't leak a CoreBluetooth session
+        if self.client:
+            try:
+                await self.client.disconnect()
+            except Exception as e:
+                logger.debug(f"Could not release client: {e}")
+            self.client = None
+        return False
+    
+    def _on_disconnected(self, client: BleakClient):
+        """Called by bleak when the link to the bike drops"""
+        logger.warning("Device disconnected")
+        self.is_connected = False
+        self._stop_event.set()
     
     async def disconnect(self):
         """Disconnect from device"""
+        self._stop_event.set()
         self.stop_update_thread()
+        self._save_pool.shutdown(wait=True)
+        if self._consumer_task:
+            self._consumer_task.cancel()
+            self._consumer_task = None
+        if self._dropped_notifications:
+            logger.warning(f"Dropped {self._dropped_notifications} notifications while the parser was behind")
         if self.client and self.is_connected:
             await self.client.disconnect()
             self.is_connected = False
@@ -213,13 +382,15 @@ class iConsoleDataReader:
         # Start update thread
         self.start_update_thread()
         
+        # Start parsing queued notifications
+        self._consumer_task = asyncio.create_task(self._consume_notifications())
+        
         # Subscribe to characteristics
         await self._subscribe_to_characteristics()
         
-        # Keep connection alive
+        # Keep connection alive until disconnect() or a dropped link
         try:
-            while True:
-                await asyncio.sleep(1)
+            await self._stop_event.wait()
         except KeyboardInterrupt:
             logger.info("Stopping...")
     
@@ -227,95 +398,161 @@ class iConsoleDataReader:
         """Subscribe to bike data characteristics"""
         logger.info("Discovering and subscribing to available characteristics...")
         
-        subscribed_count = 0
+        targets = []
         services = self.client.services
         
         for service in services:
-            logger.info(f"Service: {service.uuid}")
+            logger.debug(f"Service: {service.uuid}")
             for char in service.characteristics:
-                logger.info(f"  Characteristic: {char.uuid} - Properties: {char.properties}")
+                logger.debug(f"  Characteristic: {char.uuid} - Properties: {char.properties}")
                 
                 # Try to subscribe to any characteristic that supports notifications
-                if "notify" in char.properties or "indicate" in char.properties:
-                    try:
-                        await self.client.start_notify(char.uuid, self._create_handler(f"Service-{service.uuid[:8]}-{char.uuid[:8]}"))
-                        logger.info(f"  -> Successfully subscribed to {char.uuid}")
-                        subscribed_count += 1
-                    except Exception as e:
-                        logger.warning(f"  -> Could not subscribe to {char.uuid}: {e}")
+                if not NOTIFY_PROPERTIES.isdisjoint(char.properties):
+                    targets.append(char)
+        
+        # Prefer a single standard speed characteristic that actually streams data
+        by_uuid = {char.uuid.lower(): char for char in targets}
+        for uuid in PREFERRED_CHARACTERISTICS:
+            if uuid in by_uuid and await self._subscribe_preferred(by_uuid[uuid]):
+                return
+        
+        # No standard characteristic delivered data yet. Stay on the known bike characteristics
+        # when the device has any; only fall back to everything that notifies when it has none.
+        known = [by_uuid[uuid] for uuid in PREFERRED_CHARACTERISTICS if uuid in by_uuid]
+        if known:
+            logger.info("No preferred characteristic delivered data, subscribing to all known bike characteristics")
+            for char in targets:
+                if char.uuid.lower() not in PREFERRED_CHARACTERISTICS:
+                    logger.debug(f"  Not subscribing to {char.uuid}")
+            targets = known
+        else:
+            logger.info("No known bike characteristics, subscribing to all notifying characteristics")
+        
+        # Subscribe concurrently: one BLE round-trip of latency instead of one per characteristic
+        results = await asyncio.gather(
+            *(
+                self.client.start_notify(char.uuid, self._create_handler(char.uuid, self._parser_for(char.uuid)))
+                for char in targets
+            ),
+            return_exceptions=True,
+        )
+        
+        subscribed_count = 0
+        for char, result in zip(targets, results):
+            if isinstance(result, Exception):
+                logger.warning(f"  -> Could not subscribe to {char.uuid}: {result}")
+            else:
+                logger.info(f"  -> Successfully subscribed to {char.uuid}")
+                subscribed_count += 1
         
         if subscribed_count == 0:
             logger.error("No characteristics could be subscribed to!")
         else:
             logger.info(f"Successfully subscribed to {subscribed_count} characteristics")
     
-    def _create_handler(self, name: str):
+    async def _subscribe_preferred(self, char) -> bool:
+        """Subscribe to one characteristic and keep it only if it yields a speed promptly"""
+        self._data_received.clear()
+        try:
+            await self.client.start_notify(char.uuid, self._create_handler(char.uuid, self._parser_for(char.uuid)))
+        except Exception as e:
+            logger.warning(f"  -> Could not subscribe to {char.uuid}: {e}")
+            return False
+        
+        try:
+            await asyncio.wait_for(self._data_received.wait(), timeout=FIRST_DATA_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.info(f"  -> No speed from {char.uuid} within {FIRST_DATA_TIMEOUT:.0f}s")
+            try:
+                await self.client.stop_notify(char.uuid)
+            except Exception as e:
+                logger.warning(f"  -> Could not unsubscribe from {char.uuid}: {e}")
+            return False
+        
+        logger.info(f"  -> Receiving data from {char.uuid}")
+        return True
+    
+    def _create_handler(self, char_uuid: str, parser: Callable[[bytes], Optional[float]]):
         """Create notification handler"""
+        queue = self._notify_queue
+        
         def handler(sender, data: bytearray):
-            logger.debug(f"Received data from {name}: {data.hex()} ({len(data)} bytes)")
-            speed = self._extract_speed(data, name)
+            # Copy out of bleak's buffer and return; parsing happens in _consume_notifications
+            item = (char_uuid, parser, bytes(data))
+            try:
+                queue.put_nowait(item)
+            except asyncio.QueueFull:
+                # Parser is behind; drop the oldest packet in favour of the newest
+                queue.get_nowait()
+                queue.put_nowait(item)
+                self._dropped_notifications += 1
+        return handler
+    
+    async def _consume_notifications(self):
+        """Parse queued notifications off the BLE callback path"""
+        # Checked once per stream; the log level is fixed at startup
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        
+        while True:
+            char_uuid, parser, data = await self._notify_queue.get()
+            if debug_enabled:
+                logger.debug("Received data from %s: %s (%d bytes)", char_uuid, data.hex(), len(data))
+            try:
+                speed = parser(data)
+            except Exception as e:
+                logger.debug("Error extracting speed from %s: %s", char_uuid, e)
+                continue
             if speed is not None:
+                # Only a decoded speed proves the characteristic is worth keeping
+                self._data_received.set()
                 self._add_speed_datapoint(speed)
-            else:
-                logger.debug(f"No speed extracted from {name} data")
-        return handler
+            elif debug_enabled:
+                logger.debug("No speed extracted from %s data", char_uuid)
     
-    def _extract_speed(self, data: bytearray, char_name: str) -> Optional[float]:
-        """Extract speed from BLE data"""
-        try:
-            # Try different data formats based on characteristic name
-            if "2ad2" in char_name and len(data) >= 4:  # Indoor Bike Data
-                flags = struct.unpack('<H', data[:2])[0]
-                if flags & 0x01:  # Speed present
-                    speed = struct.unpack('<H', data[2:4])[0] / 100.0  # km/h
-                    return speed
-            
-            elif "2a5b" in char_name and len(data) >= 7:  # Speed & Cadence
-                flags = data[0]
-                if flags & 0x01:  # Wheel data present
-                    # Extract wheel revolution data
-                    wheel_revs = struct.unpack('<L', data[1:5])[0]
-                    wheel_time = struct.unpack('<H', data[5:7])[0]
-                    
-                    # Calculate speed from wheel data
-                    if self.last_wheel_revs is not None and self.last_wheel_time is not None:
-                        rev_diff = wheel_revs - self.last_wheel_revs
-                        time_diff = wheel_time - self.last_wheel_time
-                        
-                        # Handle time rollover (16-bit counter)
-                        if time_diff < 0:
-                            time_diff += 65536
-                        
-                        if time_diff > 0 and rev_diff > 0:
-                            # Time is in 1/1024 seconds
-                            time_seconds = time_diff / 1024.0
-                            distance_meters = rev_diff * 1.0525  # wheel circumference
-                            speed_ms = distance_meters / time_seconds
-                            speed_kmh = speed_ms * 3.6  # Convert m/s to km/h
-                            
-                            # Store for next calculation
-                            self.last_wheel_revs = wheel_revs
-                            self.last_wheel_time = wheel_time
-                            
-                            return speed_kmh
-                    
-                    # Store current values for next calculation
-                    self.last_wheel_revs = wheel_revs
-                    self.last_wheel_time = wheel_time
-            
-            # Generic speed extraction for unknown characteristics
-            elif len(data) >= 2:
-                # Try to interpret as simple speed value
-                try:
-                    speed = struct.unpack('<H', data[:2])[0] / 100.0
-                    if 0 <= speed <= 100:  # Reasonable speed range
-                        return speed
-                except:
-                    pass
-            
-        except Exception as e:
-            logger.debug(f"Error extracting speed from {char_name}: {e}")
+    def _parser_for(self, char_uuid: str) -> Callable[[bytes], Optional[float]]:
+        """Pick the speed parser for a characteristic (once, at subscription time)"""
+        return getattr(self, SPEED_PARSERS.get(char_uuid.lower(), '_parse_generic'))
+    
+    def _parse_indoor_bike_data(self, data: bytes) -> Optional[float]:
+        """Extract speed from FTMS Indoor Bike Data"""
+        if len(data) >= 4:
+            flags, raw_speed = _unpack_indoor_bike_speed(data)
+            if not flags & 0x01:  # Bit 0 is "More Data"; speed is present when it is clear
+                return raw_speed / 100.0  # km/h
+        return None
+    
+    def _parse_csc_measurement(self, data: bytes) -> Optional[float]:
+        """Extract speed from CSC Measurement wheel data"""
+        if len(data) < 7:
+            return None
+        
+        flags, wheel_revs, wheel_time = _unpack_csc_wheel(data)
+        if not flags & 0x01:  # Wheel data present
+            return None
+        
+        # Swap in the current values for the next calculation
+        last_revs = self.last_wheel_revs
+        last_time = self.last_wheel_time
+        self.last_wheel_revs = wheel_revs
+        self.last_wheel_time = wheel_time
+        if last_revs is None:
+            return None
         
+        # Handle counter rollover (32-bit revolutions, 16-bit event time)
+        rev_diff = (wheel_revs - last_revs) & 0xFFFFFFFF
+        time_diff = (wheel_time - last_time) & 0xFFFF
+        if not (rev_diff and time_diff):
+            return None
+        
+        # Time is in 1/1024 seconds
+        return rev_diff * WHEEL_KMH_FACTOR / time_diff
+    
+    def _parse_generic(self, data: bytes) -> Optional[float]:
+        """Try to interpret an unknown characteristic as a simple speed value"""
+        if len(data) >= 2:
+            speed = _unpack_u16(data)[0] / 100.0  # Unsigned, so never negative
+            if speed <= 100:  # Reasonable speed range
+                return speed
         return None
     
 
@@ -326,17 +563,19 @@ def main():
     
     # Create a simple shared object to pass the menubar app
     shared = {'menubar_app': None, 'reader': None}
+    menubar_ready = threading.Event()  # Set once shared['menubar_app'] is assigned
     
     def start_bluetooth():
         """Start bluetooth in background thread"""
         async def bluetooth_worker():
-            # Wait for menubar to be ready
-            while shared['menubar_app'] is None:
-                await asyncio.sleep(0.1)
+            # Wait for menubar to be ready (blocks an executor thread, not the event loop)
+            await asyncio.get_running_loop().run_in_executor(None, menubar_ready.wait)
             
             # Create reader (will scan for iConsole devices automatically)
             reader = iConsoleDataReader()
             reader.menubar_app = shared['menubar_app']
+            # Quit ends the process without unwinding this thread; stop and flush from the menu bar
+            reader.menubar_app.quit_callback = reader.stop_update_thread
             shared['reader'] = reader
             
             try:
@@ -362,6 +601,7 @@ def main():
     # Create and run the menubar app (blocks on main thread)
     menubar_app = menubar_main(update_function)
     shared['menubar_app'] = menubar_app
+    menubar_ready.set()
     menubar_app.run()
 
 if __name__ == "__main__":
@@ -4,12 +4,15 @@ iConsole Menu Bar App
 Displays current speed and cumulative distance in macOS menu bar
 """
 
+import queue
 import rumps
 
 class iConsoleMenuBarApp(rumps.App):
     def __init__(self, update_function):
         super(iConsoleMenuBarApp, self).__init__("🚴 --", quit_button=None)
         self.update_function = update_function
+        # Called on Quit before the app exits; rumps ends the process without running atexit handlers
+        self.quit_callback = None
         
         # Menu items
         self.speed_item = rumps.MenuItem("Speed: -- km/h")
@@ -17,20 +20,60 @@ class iConsoleMenuBarApp(rumps.App):
         self.quit_item = rumps.MenuItem("Quit")
         
         self.menu = [self.speed_item, self.distance_item, rumps.separator, self.quit_item]
+        
+        # Updates posted from the reader thread, applied on the main run loop
+        self._updates = queue.SimpleQueue()
+        self._update_timer = rumps.Timer(self._apply_updates, 1)
+        self._update_timer.start()
+        
+        # Last rendered strings; AppKit setters are skipped when nothing changed
+        self._last_title = None
+        self._last_speed_s = None
+        self._last_dist_s = None
+    
+    def post_update(self, speed, distance):
+        """Queue a display update (safe to call from any thread)"""
+        self._updates.put((speed, distance))
+    
+    def _apply_updates(self, _):
+        """Apply the most recent queued update on the main thread"""
+        latest = None
+        try:
+            while True:
+                latest = self._updates.get_nowait()
+        except queue.Empty:
+            pass
+        if latest is not None:
+            self.update_display(*latest)
     
     def update_display(self, speed, distance):
         """Update the menu bar display"""
         if speed > 0:
-            self.title = f"🚴 {speed:.0f} km/h • {distance:.2f} km"
+            title = f"🚴 {speed:.0f} km/h • {distance:.2f} km"
         else:
-            self.title = f"🚴 -- • {distance:.2f} km"
+            title = f"🚴 -- • {distance:.2f} km"
+        if title != self._last_title:
+            self.title = title
+            self._last_title = title
+        
+        speed_s = f"Speed: {speed:.1f} km/h"
+        if speed_s != self._last_speed_s:
+            self.speed_item.title = speed_s
+            self._last_speed_s = speed_s
         
-        self.speed_item.title = f"Speed: {speed:.1f} km/h"
-        self.distance_item.title = f"Distance: {distance:.3f} km"
+        dist_s = f"Distance: {distance:.3f} km"
+        if dist_s != self._last_dist_s:
+            self.distance_item.title = dist_s
+            self._last_dist_s = dist_s
     
     @rumps.clicked("Quit")
     def quit_clicked(self, _):
-        rumps.quit_application()
+        self._update_timer.stop()
+        try:
+            if self.quit_callback:
+                self.quit_callback()
+        finally:
+            rumps.quit_application()
 
 def main(update_function):
     app = iConsoleMenuBarApp(update_function)
@@ -12,9 +12,11 @@ OPTIONS = {
         'CFBundleVersion': '1.0.0',
         'NSHighResolutionCapable': True,
     },
-    'packages': ['rumps', 'bleak', 'asyncio_mqtt'],
+    'packages': ['rumps', 'bleak'],
     'includes': ['iconsole_reader', 'menubar_app'],
-    'excludes': ['tkinter', 'test', 'unittest', 'distutils'],
+    'excludes': ['tkinter', 'test', 'unittest', 'distutils',
+                 'pydoc', 'doctest', 'pdb', 'xmlrpc', 'lib2to3', 'pytest'],
+    'optimize': 2,  # Bytecode without asserts and docstrings
 }
 
 setup(